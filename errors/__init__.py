@@ -1,5 +1,8 @@
 from .args_parsing import ArgParsingError
 from .checksum_verification import ChecksumVerificationError
 from .initial_folder_not_found import InitialFolderNotFoundError
+from .manifest_corrupted import ManifestCorruptedError
+from .manifest_not_found import ManifestNotFoundError
+from .manifest_verification import ManifestVerificationError
 from .no_files_to_sort import NoFilesToSortError
 from .target_folder_is_relative_to_initial_folder import TargetFolderIsRelativeToInitialFolderError
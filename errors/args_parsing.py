@@ -1,6 +1,6 @@
 class ArgParsingError(Exception):
-    def __init__(self):
-        self.__description = f'Error! The required argument(s) was(re) not entered'
+    def __init__(self, description='Error! The required argument(s) was(re) not entered'):
+        self.__description = description
 
     def __str__(self):
         return f'{self.__description}'
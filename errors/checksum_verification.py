@@ -1,7 +1,10 @@
 class ChecksumVerificationError(Exception):
-    def __init__(self):
-        self.__description = 'Error! Checksum verification completed with an error. ' \
-                             'Deleting of the initial files canceled.'
+    __slots__ = ['__verification_mode']
+
+    def __init__(self, verification_mode):
+        self.__verification_mode = verification_mode
+        self.__description = f'Error! Verification of the sorted files ("{self.__verification_mode}" mode) ' \
+                             f'completed with an error. Deleting of the initial files canceled.'
 
     def __str__(self):
         return f'{self.__description}'
@@ -0,0 +1,9 @@
+class ManifestCorruptedError(Exception):
+    __slots__ = ['__manifest_path']
+
+    def __init__(self, manifest_path):
+        self.__manifest_path = manifest_path
+        self.__description = f'Error! The verification manifest is corrupted: {self.__manifest_path}'
+
+    def __str__(self):
+        return f'{self.__description}'
@@ -0,0 +1,9 @@
+class ManifestNotFoundError(Exception):
+    __slots__ = ['__folder_name']
+
+    def __init__(self, folder_name):
+        self.__folder_name = folder_name
+        self.__description = f'Error! The verification manifest not found in the folder: {self.__folder_name}'
+
+    def __str__(self):
+        return f'{self.__description}'
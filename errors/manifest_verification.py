@@ -0,0 +1,10 @@
+class ManifestVerificationError(Exception):
+    __slots__ = ['__failed_files']
+
+    def __init__(self, failed_files):
+        self.__failed_files = failed_files
+        self.__description = f'Error! Manifest verification completed with an error. ' \
+                             f'Missing or damaged file(s): {", ".join(self.__failed_files)}'
+
+    def __str__(self):
+        return f'{self.__description}'
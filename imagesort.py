@@ -1,8 +1,10 @@
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
 from hashlib import sha256
-from os import chmod, mkdir, remove, rename
+from json import dump as json_dump
+from json import load as json_load
+from os import chmod, fsync, mkdir, remove, rename
 from os import walk as os_walk
-from os.path import abspath, dirname, isdir, isfile, normpath, splitext
+from os.path import abspath, dirname, getsize, isdir, isfile, normpath, relpath, splitext
 from os.path import join as os_path_join
 from pathlib import Path
 from shutil import copy as shutil_copy
@@ -10,20 +12,34 @@ from shutil import rmtree
 from stat import S_IWRITE
 from sys import exit as sys_exit
 
+try:
+    from os import POSIX_FADV_DONTNEED, posix_fadvise
+except ImportError:  # not available on Windows and macOS
+    posix_fadvise = None
+
 from chameleon import PageTemplateLoader
 
-from errors import ArgParsingError, ChecksumVerificationError, \
-    InitialFolderNotFoundError, NoFilesToSortError, TargetFolderIsRelativeToInitialFolderError
+from errors import ArgParsingError, ChecksumVerificationError, InitialFolderNotFoundError, \
+    ManifestCorruptedError, ManifestNotFoundError, ManifestVerificationError, NoFilesToSortError, \
+    TargetFolderIsRelativeToInitialFolderError
 from image_att.image_attributes import ImageAttributes
 
 SCRIPT_PATH = abspath(dirname(__file__))
 SHA256_BLOCK_SIZE = 65536
+SAMPLE_BLOCK_SIZE = 65536
+SAMPLE_OFFSETS_AMOUNT = 8
+MANIFEST_NAME = 'ImageSort manifest.json'
+VERIFICATION_MESSAGES = {'full': 'Checksum verification completed successfully',
+                         'sampled': 'Sampled checksum verification completed successfully',
+                         'size': 'Size verification completed successfully',
+                         'deferred': f'Size verification completed successfully, '
+                                     f'checksums were written to the "{MANIFEST_NAME}"'}
 
 
 def parse_main_args() -> 'argparse.Namespace':
     """The argparse module returns ArgumentParser object with main data from CLI."""
     parser = ArgumentParser(prog='ImageSort',
-                            usage='imagesort.py [-h] [script_mode, initial_folder, target_folder]',
+                            usage='imagesort.py [-h] [--verify VERIFY] [script_mode, initial_folder, target_folder]',
                             formatter_class=RawDescriptionHelpFormatter,
                             description='''
         %(prog)s sorts images by their resolutions.
@@ -31,23 +47,45 @@ def parse_main_args() -> 'argparse.Namespace':
           dryrun "initial_dir" "report_dir" = app sorts files from "ini_dir" and generates html report in "report_dir"
           copy "initial_dir" "target_dir" = app sorts and copies files from "initial_dir" into "target_dir"
           move "initial_dir" "target_dir" = app sorts and moves files from "initial_dir" into "target_dir"
-          sort "initial_dir" = app sorts files into "initial_dir" and deletes the initial files''')
+          sort "initial_dir" = app sorts files into "initial_dir" and deletes the initial files
+          verify "target_dir" = app checks sorted files in "target_dir" against the manifest of the deferred verification
+        Verification modes of the sorted files (--verify):
+          full = checksums of the whole initial and sorted files are compared (default)
+          sampled = checksums of the head, the tail and fixed offsets of the files are compared
+          size = sizes of the files are compared
+          deferred = sizes of the files are compared and checksums of the initial files are written to the manifest
+                     "ImageSort manifest.json" in "target_dir", the manifest can be checked later by "verify" mode,
+                     available only for "copy" mode: damaged files can be restored from the initial files
+        "dryrun" and "verify" modes don't take "--verify".''')
     parser.add_argument('script_mode', type=str, help='Choose the mode',
-                        choices=['dryrun', 'copy', 'move', 'sort'])
+                        choices=['dryrun', 'copy', 'move', 'sort', 'verify'])
     parser.add_argument('initial_folder', type=Path, help='Input the initial folder', nargs='?', default=None)
     parser.add_argument('target_folder', type=Path, help='Input the target folder', nargs='?', default=None)
+    parser.add_argument('--verify', type=str, help='Choose the verification mode', default=None,
+                        choices=['full', 'sampled', 'size', 'deferred'])
     return parser.parse_args()
 
 
 def get_global_variables(CLI_data: 'argparse.Namespace') -> None:
-    """Returns global variables (MODE, INITIAL FOLDER, TARGET FOLDER) from ArgumentParser object."""
-    global MODE, INITIAL_FOLDER, TARGET_FOLDER
+    """Returns global variables (MODE, VERIFY, INITIAL FOLDER, TARGET FOLDER) from ArgumentParser object."""
+    global MODE, VERIFY, INITIAL_FOLDER, TARGET_FOLDER
     MODE = CLI_data.script_mode
+    if MODE == 'verify' and CLI_data.target_folder:
+        raise ArgParsingError('Error! The "verify" mode takes only the folder with the manifest, '
+                              'the target folder is not allowed')
+    if MODE in ('dryrun', 'verify') and CLI_data.verify:
+        raise ArgParsingError(f'Error! The "{MODE}" mode does not verify sorted files, "--verify" is not allowed')
+    if MODE in ('move', 'sort') and CLI_data.verify == 'deferred':
+        raise ArgParsingError(f'Error! The "deferred" verification is not allowed for the "{MODE}" mode, '
+                              f'the initial files would be deleted before the verification')
+    VERIFY = CLI_data.verify or 'full'
     INITIAL_FOLDER = convert_path_to_str(CLI_data.initial_folder)
     if not isdir(INITIAL_FOLDER):
         raise InitialFolderNotFoundError(INITIAL_FOLDER)
 
-    if MODE == 'sort':
+    if MODE == 'verify':
+        TARGET_FOLDER = INITIAL_FOLDER
+    elif MODE == 'sort':
         TARGET_FOLDER = create_temporary_folder()
     else:
         TARGET_FOLDER = convert_path_to_str(CLI_data.target_folder)
@@ -99,12 +137,15 @@ def get_files_to_sort_from_initial_dir() -> list and dict:
 
 def get_all_files_from_folder(given_folder: str) -> list and dict:
     """Returns list of paths of all files from given directory and full structure of the given directory.
+    The manifest of the deferred verification in the given directory is skipped.
     full_paths_from_dir = ['full_path_to_the_file_1', 'full_path_to_the_file_2', etc.]
     dir_structure = {'full_path_to_the_folder_1': ['file_name_1', 'file_name_2', etc.], etc.}
     """
     full_paths_from_dir = list()
     dir_structure = dict()
     for dir_path, dir_name, files_in_dir in os_walk(given_folder):
+        if dir_path == given_folder and MANIFEST_NAME in files_in_dir:
+            files_in_dir.remove(MANIFEST_NAME)
         files_in_dir.sort()
         for file in files_in_dir:
             full_paths_from_dir.append(os_path_join(dir_path, file))
@@ -206,30 +247,55 @@ def create_dir_if_not_exists(given_path: str) -> None:
 
 
 def integrity_validation(ini_files_attributes: list) -> None:
-    """Compares checksums of each file from initial folder and copied files after reorganization.
+    """Compares each file from initial folder and copied file after reorganization according to
+    the verification mode (VERIFY). For 'deferred' mode sizes of the files are compared and
+    checksums of the initial files are written to the manifest in the target folder.
     Displays information about amount of sorted files."""
     total_ini_files = len(ini_files_attributes)
     total_images = 0
     total_not_images = 0
+    manifest_data = dict()
     for file_to_sort in ini_files_attributes:
         initial_file = file_to_sort.get_initial_file_path()
         sorted_file = file_to_sort.get_sorted_file_path()
-        if get_checksum(initial_file) != get_checksum(sorted_file):
-            raise ChecksumVerificationError
+        if not files_are_identical(initial_file, sorted_file):
+            raise ChecksumVerificationError(VERIFY)
+        if VERIFY == 'deferred':
+            manifest_data[relpath(sorted_file, TARGET_FOLDER)] = get_checksum(initial_file)
         if file_to_sort.get_image_resolution() == 'Not images':
             total_not_images += 1
         else:
             total_images += 1
-    print(f'\nChecksum verification completed successfully\n'
+    if VERIFY == 'deferred':
+        write_manifest(manifest_data)
+    print(f'\n{VERIFICATION_MESSAGES[VERIFY]}\n'
           f'From initial folder was(re) sorted successfully {total_ini_files} files:\n'
           f'Images{total_images:>20}\n'
           f'Not images{total_not_images:>16}')
 
 
-def get_checksum(file_path: str) -> str:
-    """Returns checksum of the given file."""
+def files_are_identical(initial_file: str, sorted_file: str) -> bool:
+    """Compares initial and sorted files according to the verification mode (VERIFY):
+    'full' - checksums of the whole files, 'sampled' - checksums of the parts of the files,
+    'size' and 'deferred' - sizes of the files."""
+    if VERIFY == 'full':
+        return get_checksum(initial_file) == get_checksum(sorted_file)
+    elif VERIFY == 'sampled':
+        return get_sampled_checksum(initial_file) == get_sampled_checksum(sorted_file)
+    else:  # VERIFY in ('size', 'deferred'):
+        return getsize(initial_file) == getsize(sorted_file)
+
+
+def get_checksum(file_path: str, drop_cache: bool = False) -> str:
+    """Returns checksum of the given file.
+    If drop_cache is True, then the file is flushed to the disk and evicted from the page cache before reading
+    (if OS supports it), so the checksum is calculated from the data on the disk.
+    Dirty pages are not evicted, therefore the file is flushed first."""
     sha_hashing = sha256()
     with open(file_path, 'rb') as CF:
+        if drop_cache and posix_fadvise is not None:
+            fsync(CF.fileno())
+            posix_fadvise(CF.fileno(), 0, 0, POSIX_FADV_DONTNEED)
         file_buffer = CF.read(SHA256_BLOCK_SIZE)
         while len(file_buffer) > 0:
             sha_hashing.update(file_buffer)
@@ -237,6 +303,84 @@ def get_checksum(file_path: str) -> str:
     return sha_hashing.hexdigest()
 
 
+def get_sampled_checksum(file_path: str) -> str:
+    """Returns checksum of the size, the head, the tail and blocks at fixed offsets of the given file.
+    Offsets depend only on the file size, so files with equal content get equal checksums.
+    Small files are hashed completely."""
+    file_size = getsize(file_path)
+    if file_size <= SAMPLE_BLOCK_SIZE * (SAMPLE_OFFSETS_AMOUNT + 2):
+        return get_checksum(file_path)
+
+    step = (file_size - SAMPLE_BLOCK_SIZE) // (SAMPLE_OFFSETS_AMOUNT + 1)
+    offsets = [step * num for num in range(SAMPLE_OFFSETS_AMOUNT + 1)]
+    offsets.append(file_size - SAMPLE_BLOCK_SIZE)
+    sha_hashing = sha256(str(file_size).encode())
+    with open(file_path, 'rb') as CF:
+        for offset in offsets:
+            CF.seek(offset)
+            sha_hashing.update(CF.read(SAMPLE_BLOCK_SIZE))
+    return sha_hashing.hexdigest()
+
+
+def write_manifest(manifest_data: dict) -> None:
+    """Writes checksums of the sorted files to the manifest in the target folder.
+    Paths of the sorted files are relative to the target folder, so the manifest stays valid after
+    renaming of the folder (see 'sort' mode). If manifest already exists, then it will be updated."""
+    manifest_path = os_path_join(TARGET_FOLDER, MANIFEST_NAME)
+    if isfile(manifest_path):
+        manifest_data = read_manifest(manifest_path) | manifest_data
+    with open(manifest_path, 'w') as manifest_file:
+        json_dump(manifest_data, manifest_file, indent=4, sort_keys=True)
+
+
+def read_manifest(manifest_path: str) -> dict:
+    """Returns checksums of the sorted files from the given manifest.
+    If the manifest couldn't be parsed then the ManifestCorruptedError is raised."""
+    try:
+        with open(manifest_path, 'r') as manifest_file:
+            manifest_data = json_load(manifest_file)
+    except ValueError:
+        raise ManifestCorruptedError(manifest_path)
+    if not isinstance(manifest_data, dict):
+        raise ManifestCorruptedError(manifest_path)
+    return manifest_data
+
+
+def carry_manifest(initial_files: list) -> None:
+    """Carries the manifest of the deferred verification from the initial folder to the target folder
+    before deleting of the initial folder. Paths of the re-sorted files are replaced by their new paths,
+    other entries are kept as is."""
+    manifest_path = os_path_join(INITIAL_FOLDER, MANIFEST_NAME)
+    if not isfile(manifest_path):
+        return
+    manifest_data = read_manifest(manifest_path)
+    new_paths = {relpath(file_to_sort.get_initial_file_path(), INITIAL_FOLDER):
+                 relpath(file_to_sort.get_sorted_file_path(), TARGET_FOLDER)
+                 for file_to_sort in initial_files}
+    carried_manifest = {new_paths.get(sorted_file, sorted_file): checksum
+                        for sorted_file, checksum in manifest_data.items()}
+    write_manifest(carried_manifest)
+
+
+def verify_manifest(given_folder: str) -> None:
+    """Compares checksums of the sorted files from the given folder with checksums from the manifest.
+    Files are evicted from the page cache before reading, so the data on the disk is verified."""
+    manifest_path = os_path_join(given_folder, MANIFEST_NAME)
+    if not isfile(manifest_path):
+        raise ManifestNotFoundError(given_folder)
+    manifest_data = read_manifest(manifest_path)
+
+    failed_files = list()
+    for sorted_file, checksum in manifest_data.items():
+        sorted_file_path = os_path_join(given_folder, sorted_file)
+        if not isfile(sorted_file_path) or get_checksum(sorted_file_path, drop_cache=True) != checksum:
+            failed_files.append(sorted_file)
+    if failed_files:
+        raise ManifestVerificationError(failed_files)
+    print(f'\nManifest verification completed successfully\n'
+          f'Checked files{len(manifest_data):>13}')
+
+
 def delete_folder(folder_for_deleting: str) -> None:
     """Deletes given folder with all nested folder(s) and file(s)."""
     try:
@@ -279,7 +423,8 @@ def main(CLI_data: 'argparse.Namespace'):
     Secondly, main arguments are defined from the command line by using argparse module:
         parse_main_args() returns argparse.Namespace object
         get_global_variables(CLI_data) returns:
-            mode ('dryrun', 'copy', 'move', 'sort')
+            mode ('dryrun', 'copy', 'move', 'sort', 'verify')
+            verification mode ('full', 'sampled', 'size', 'deferred')
             initial folder (full path)
             target folder (full path)
 
@@ -295,16 +440,24 @@ def main(CLI_data: 'argparse.Namespace'):
     For 'move' mode are executed next functions:
         copy_sorted_files()
         integrity_validation()
+        carry_manifest()
         delete_folder()
     For 'sort' mode are executed next functions:
         create_temporary_folder()
         copy_sorted_files()
         integrity_validation()
+        carry_manifest()
         delete_folder()
         rename_temp_folder_to_initial()
+    For 'verify' mode is executed:
+        verify_manifest()
     """
 
     get_global_variables(CLI_data)
+    if MODE == 'verify':
+        verify_manifest(INITIAL_FOLDER)
+        return
+
     initial_files_to_sort, initial_dir_structure = get_files_to_sort_from_initial_dir()
     define_resolution_for_each_image(initial_files_to_sort)
 
@@ -327,12 +480,14 @@ def process_mode_copy(initial_files):
 def process_mode_move(initial_files):
     sort_and_copy_files(initial_files)
     integrity_validation(initial_files)
+    carry_manifest(initial_files)
     delete_folder(INITIAL_FOLDER)
 
 
 def process_mode_sort(initial_files):
     sort_and_copy_files(initial_files)
     integrity_validation(initial_files)
+    carry_manifest(initial_files)
     delete_folder(INITIAL_FOLDER)
     rename_temp_folder_to_initial()
 
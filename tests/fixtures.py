@@ -2,6 +2,7 @@ import json
 from argparse import ArgumentParser
 from os import walk as os_walk
 from os.path import join as os_path_join
+from os.path import relpath
 from pathlib import Path
 from shutil import copytree
 
@@ -37,9 +38,11 @@ def reference_data():
 def simulate_argparse():
     def parse_args(input_args: list):
         test_parser = ArgumentParser()
-        test_parser.add_argument('script_mode', type=str, choices=['dryrun', 'copy', 'move', 'sort'])
+        test_parser.add_argument('script_mode', type=str, choices=['dryrun', 'copy', 'move', 'sort', 'verify'])
         test_parser.add_argument('initial_folder', type=Path, nargs='?')
         test_parser.add_argument('target_folder', type=Path, nargs='?')
+        test_parser.add_argument('--verify', type=str, default=None,
+                                 choices=['full', 'sampled', 'size', 'deferred'])
 
         return test_parser.parse_args(input_args)
     return parse_args
@@ -84,3 +87,22 @@ def folder_structure():
             output_dict[k] = sorted(dir_structure[k])
         return output_dict
     return get_folder_structure
+
+
+@pytest.fixture
+def write_test_file():
+    def write_data(file_path: str, file_data: bytes):
+        with open(file_path, 'wb') as data_file:
+            data_file.write(file_data)
+    return write_data
+
+
+@pytest.fixture
+def relative_file_paths():
+    def get_relative_file_paths(given_folder: str):
+        file_paths = list()
+        for dir_path, dir_name, files_in_dir in os_walk(given_folder):
+            for file in files_in_dir:
+                file_paths.append(relpath(os_path_join(dir_path, file), given_folder))
+        return sorted(file_paths)
+    return get_relative_file_paths
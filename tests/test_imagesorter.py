@@ -1,5 +1,6 @@
+from json import load as json_load
 from os import mkdir
-from os.path import isdir
+from os.path import isdir, isfile
 from os.path import join as os_path_join
 from tempfile import TemporaryDirectory
 
@@ -134,3 +135,177 @@ def test_sort_mode(set_up: fixture, create_initial_folder: fixture, ini_folder:
     test_data = simulate_argparse(['sort', ini_folder])
     imagesort.main(test_data)
     assert reference_data == folder_structure(ini_folder)
+
+
+def test_copy_mode_with_sampled_verification(set_up: fixture, ini_folder: fixture, folder_structure: fixture,
+                                             simulate_argparse: fixture):
+    """Test of copy mode with sampled verification, result is the same as with full verification."""
+    with TemporaryDirectory() as temp_dir:
+        full_dir = os_path_join(temp_dir, 'full')
+        sampled_dir = os_path_join(temp_dir, 'sampled')
+        imagesort.main(simulate_argparse(['copy', ini_folder, full_dir]))
+        imagesort.main(simulate_argparse(['copy', ini_folder, sampled_dir, '--verify', 'sampled']))
+        assert folder_structure(full_dir) == folder_structure(sampled_dir)
+        assert not isfile(os_path_join(sampled_dir, imagesort.MANIFEST_NAME))
+
+
+def test_copy_mode_with_size_verification(set_up: fixture, ini_folder: fixture, folder_structure: fixture,
+                                          simulate_argparse: fixture):
+    """Test of copy mode with size verification, result is the same as with full verification."""
+    with TemporaryDirectory() as temp_dir:
+        full_dir = os_path_join(temp_dir, 'full')
+        size_dir = os_path_join(temp_dir, 'size')
+        imagesort.main(simulate_argparse(['copy', ini_folder, full_dir]))
+        imagesort.main(simulate_argparse(['copy', ini_folder, size_dir, '--verify', 'size']))
+        assert folder_structure(full_dir) == folder_structure(size_dir)
+        assert not isfile(os_path_join(size_dir, imagesort.MANIFEST_NAME))
+
+
+def test_integrity_validation_of_damaged_copy(set_up: fixture, write_test_file: fixture, monkeypatch: fixture):
+    """Test of size and sampled verification, truncated or changed sorted file is detected."""
+    with TemporaryDirectory() as temp_dir:
+        initial_file = os_path_join(temp_dir, 'initial file')
+        sorted_file = os_path_join(temp_dir, 'sorted file')
+        write_test_file(initial_file, b'initial data')
+        file_to_sort = imagesort.ImageAttributes(initial_file)
+        file_to_sort.set_sorted_file_path(sorted_file)
+        for verification_mode, damaged_data in (('size', b'initial'), ('sampled', b'initial'),
+                                                ('sampled', b'damaged data')):
+            monkeypatch.setattr(imagesort, 'VERIFY', verification_mode, raising=False)
+            write_test_file(sorted_file, damaged_data)
+            with raises(imagesort.ChecksumVerificationError):
+                imagesort.integrity_validation([file_to_sort])
+
+
+def test_sampled_checksum_of_identical_files(set_up: fixture, write_test_file: fixture):
+    """Test of sampled checksum, large files with identical content get the same checksum."""
+    with TemporaryDirectory() as temp_dir:
+        file_data = bytes(range(256)) * (imagesort.SAMPLE_BLOCK_SIZE * (imagesort.SAMPLE_OFFSETS_AMOUNT + 3) // 256)
+        write_test_file(os_path_join(temp_dir, 'file 1'), file_data)
+        write_test_file(os_path_join(temp_dir, 'file 2'), file_data)
+        assert imagesort.get_sampled_checksum(os_path_join(temp_dir, 'file 1')) == \
+               imagesort.get_sampled_checksum(os_path_join(temp_dir, 'file 2'))
+
+
+def test_sampled_checksum_of_changed_large_file(set_up: fixture, write_test_file: fixture):
+    """Test of sampled checksum, changes in the head, at the middle offset and in the tail
+    of the large file are detected."""
+    file_size = imagesort.SAMPLE_BLOCK_SIZE * (imagesort.SAMPLE_OFFSETS_AMOUNT + 3)
+    step = (file_size - imagesort.SAMPLE_BLOCK_SIZE) // (imagesort.SAMPLE_OFFSETS_AMOUNT + 1)
+    middle_offset = step * ((imagesort.SAMPLE_OFFSETS_AMOUNT + 1) // 2)
+    with TemporaryDirectory() as temp_dir:
+        test_file = os_path_join(temp_dir, 'large file')
+        write_test_file(test_file, bytes(file_size))
+        initial_checksum = imagesort.get_sampled_checksum(test_file)
+        for changed_byte in (0, middle_offset, file_size - 1):
+            file_data = bytearray(file_size)
+            file_data[changed_byte] = 1
+            write_test_file(test_file, file_data)
+            assert initial_checksum != imagesort.get_sampled_checksum(test_file)
+
+
+def test_deferred_verification(set_up: fixture, ini_folder: fixture, simulate_argparse: fixture,
+                                relative_file_paths: fixture):
+    """Test of copy mode with deferred verification and checking of the manifest by verify mode."""
+    with TemporaryDirectory() as temp_dir:
+        test_data = simulate_argparse(['copy', ini_folder, temp_dir, '--verify', 'deferred'])
+        imagesort.main(test_data)
+        with open(os_path_join(temp_dir, imagesort.MANIFEST_NAME), 'r') as manifest_file:
+            manifest_data = json_load(manifest_file)
+        sorted_files = relative_file_paths(temp_dir)
+        sorted_files.remove(imagesort.MANIFEST_NAME)
+        assert sorted(manifest_data) == sorted_files
+        assert sorted(manifest_data.values()) == sorted(imagesort.get_checksum(os_path_join(ini_folder, file))
+                                                        for file in relative_file_paths(ini_folder))
+        imagesort.main(simulate_argparse(['verify', temp_dir]))
+
+
+def test_deferred_verification_of_damaged_file(set_up: fixture, ini_folder: fixture, simulate_argparse: fixture):
+    """Test of verify mode, sorted file was damaged after deferred verification."""
+    with TemporaryDirectory() as temp_dir:
+        test_data = simulate_argparse(['copy', ini_folder, temp_dir, '--verify', 'deferred'])
+        imagesort.main(test_data)
+        with open(os_path_join(temp_dir, 'Not images', 'not image'), 'ab') as damaged_file:
+            damaged_file.write(b'damaged data')
+        with raises(imagesort.ManifestVerificationError):
+            imagesort.main(simulate_argparse(['verify', temp_dir]))
+
+
+def test_verify_mode_no_manifest(set_up: fixture, ini_folder: fixture, simulate_argparse: fixture):
+    """Test of verify mode, there is no manifest in the given folder."""
+    with raises(imagesort.ManifestNotFoundError):
+        imagesort.main(simulate_argparse(['verify', ini_folder]))
+
+
+def test_verify_mode_corrupted_manifest(set_up: fixture, ini_folder: fixture, simulate_argparse: fixture):
+    """Test of verify mode, the manifest in the given folder is corrupted."""
+    with TemporaryDirectory() as temp_dir:
+        with open(os_path_join(temp_dir, imagesort.MANIFEST_NAME), 'w') as manifest_file:
+            manifest_file.write('{"Not images/not image": "trunc')
+        with raises(imagesort.ManifestCorruptedError):
+            imagesort.main(simulate_argparse(['verify', temp_dir]))
+
+
+def test_verify_mode_with_target_folder(set_up: fixture, ini_folder: fixture, simulate_argparse: fixture):
+    """Test of verify mode, target folder is not allowed."""
+    with TemporaryDirectory() as temp_dir:
+        with raises(imagesort.ArgParsingError):
+            imagesort.main(simulate_argparse(['verify', ini_folder, temp_dir]))
+
+
+def test_verify_mode_with_verification_mode(set_up: fixture, ini_folder: fixture, simulate_argparse: fixture):
+    """Test of verify mode, verification mode is not allowed."""
+    with raises(imagesort.ArgParsingError):
+        imagesort.main(simulate_argparse(['verify', ini_folder, '--verify', 'full']))
+
+
+def test_dryrun_mode_with_verification_mode(set_up: fixture, ini_folder: fixture, simulate_argparse: fixture):
+    """Test of dryrun mode, verification mode is not allowed."""
+    with TemporaryDirectory() as temp_dir:
+        with raises(imagesort.ArgParsingError):
+            imagesort.main(simulate_argparse(['dryrun', ini_folder, temp_dir, '--verify', 'size']))
+
+
+def test_deferred_verification_for_move_and_sort_modes(set_up: fixture, ini_folder: fixture,
+                                                       simulate_argparse: fixture):
+    """Test of move and sort modes, deferred verification is not allowed."""
+    with TemporaryDirectory() as temp_dir:
+        with raises(imagesort.ArgParsingError):
+            imagesort.main(simulate_argparse(['move', ini_folder, temp_dir, '--verify', 'deferred']))
+    with raises(imagesort.ArgParsingError):
+        imagesort.main(simulate_argparse(['sort', ini_folder, '--verify', 'deferred']))
+
+
+def test_sort_mode_carries_manifest(set_up: fixture, ini_folder: fixture, folder_structure: fixture,
+                                    simulate_argparse: fixture):
+    """Test of sort mode run twice in the folder with the manifest, the manifest is not sorted as a file
+    and stays valid."""
+    with TemporaryDirectory() as temp_dir:
+        sorted_dir = os_path_join(temp_dir, 'sorted')
+        imagesort.main(simulate_argparse(['copy', ini_folder, sorted_dir, '--verify', 'deferred']))
+        sorted_structure = folder_structure(sorted_dir)
+        with open(os_path_join(sorted_dir, imagesort.MANIFEST_NAME), 'r') as manifest_file:
+            initial_manifest = json_load(manifest_file)
+
+        for _ in range(2):
+            imagesort.main(simulate_argparse(['sort', sorted_dir, '--verify', 'size']))
+            with open(os_path_join(sorted_dir, imagesort.MANIFEST_NAME), 'r') as manifest_file:
+                assert initial_manifest == json_load(manifest_file)
+            assert sorted_structure == folder_structure(sorted_dir)
+        imagesort.main(simulate_argparse(['verify', sorted_dir]))
+
+
+def test_move_mode_carries_manifest(set_up: fixture, ini_folder: fixture, simulate_argparse: fixture,
+                                    relative_file_paths: fixture):
+    """Test of move mode from the folder with the manifest, the manifest is carried to the target folder."""
+    with TemporaryDirectory() as temp_dir:
+        first_temp_dir = os_path_join(temp_dir, '1')
+        second_temp_dir = os_path_join(temp_dir, '2')
+        imagesort.main(simulate_argparse(['copy', ini_folder, first_temp_dir, '--verify', 'deferred']))
+        imagesort.main(simulate_argparse(['move', first_temp_dir, second_temp_dir]))
+        with open(os_path_join(second_temp_dir, imagesort.MANIFEST_NAME), 'r') as manifest_file:
+            manifest_data = json_load(manifest_file)
+        sorted_files = relative_file_paths(second_temp_dir)
+        sorted_files.remove(imagesort.MANIFEST_NAME)
+        assert sorted(manifest_data) == sorted_files
+        imagesort.main(simulate_argparse(['verify', second_temp_dir]))